@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 from langchain_core.documents import Document
@@ -818,6 +818,7 @@ def hybrid_answer_question(
     question: str,
     config: RAGConfig,
     show_reasoning: bool = False,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Tuple[str, List[Document], Optional[str], Dict[str, Any]]:
     """
     Hybrid legal RAG (NO ReAct):
@@ -894,7 +895,7 @@ def hybrid_answer_question(
     )
 
     user_prompt = "\n\n".join(user_parts)
-    answer = llm_backend.chat(system_prompt, user_prompt)
+    answer = llm_backend.chat(system_prompt, user_prompt, on_token=on_token)
 
     reasoning_trace: Optional[str] = None
     if show_reasoning:
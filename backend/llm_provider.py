@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+from typing import Callable, List, Optional
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_openai import ChatOpenAI
@@ -17,6 +17,18 @@ from backend.config import RAGConfig
 # OpenRouter API configuration
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
+# chat()/invoke() return these texts instead of raising on failure
+LLM_ERROR_PREFIX = "[LLM error]"
+LLM_NOT_CONFIGURED_PREFIX = "LLM provider is not correctly configured"
+
+
+def is_llm_error(text: str) -> bool:
+    """True if `text` is one of the error messages returned by LLMBackend"""
+    # An error can also follow a partially streamed answer (see LLMBackend._error_reply)
+    return isinstance(text, str) and (
+        LLM_ERROR_PREFIX in text or text.startswith(LLM_NOT_CONFIGURED_PREFIX)
+    )
+
 
 class LLMBackend:
     """
@@ -118,21 +130,53 @@ class LLMBackend:
     # ------------------------------------------------------------------
     # High-level chat method used by RAG pipeline
     # ------------------------------------------------------------------
-    def chat(self, system_prompt: str, user_prompt: str) -> str:
+    def _invoke_or_stream(self, llm: BaseChatModel, prompt, on_token: Optional[Callable[[str], None]]):
+        """Invoke the model, or stream it chunk by chunk to `on_token` when given"""
+        if on_token is None:
+            return llm.invoke(prompt)
+
+        parts = []
+        for chunk in llm.stream(prompt):
+            text = chunk.content if hasattr(chunk, "content") else str(chunk)
+            if text:
+                on_token(text)
+                parts.append(text)
+        return "".join(parts)
+
+    def _error_reply(self, sent: List[str], error: Exception, on_token: Optional[Callable[[str], None]]) -> str:
+        """
+        Error text returned by chat(). If part of the answer was already
+        streamed, the error is streamed after it so that the text shown to the
+        user and the returned text are the same.
+        """
+        if not sent:
+            return f"{LLM_ERROR_PREFIX} {error}"
+        suffix = f"\n\n{LLM_ERROR_PREFIX} {error}"
+        on_token(suffix)
+        return "".join(sent) + suffix
+
+    def chat(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> str:
         """
         High-level method to send a chat request to the LLM.
         
         Args:
             system_prompt: System/instruction prompt
             user_prompt: User query
+            on_token: Optional callback; when set, the response is streamed
+                and each text chunk is passed to it as it arrives
         
         Returns:
-            LLM response as string
+            LLM response as string (the full text, also when streaming)
         """
         llm = self.get_langchain_llm()
         if llm is None:
             return (
-                "LLM provider is not correctly configured or the model could not be "
+                f"{LLM_NOT_CONFIGURED_PREFIX} or the model could not be "
                 "loaded.\n\n"
                 "Please check your configuration:\n"
                 "- If provider = **huggingface**, set `llm_model_name` to a valid "
@@ -141,22 +185,32 @@ class LLMBackend:
                 "- If provider = **openrouter**, make sure `OPENROUTER_API_KEY` is set."
             )
 
+        # Track what has already been streamed, so a failure never re-sends it
+        sent: List[str] = []
+        tracked_on_token = None
+        if on_token is not None:
+            def tracked_on_token(text: str):
+                sent.append(text)
+                on_token(text)
+
         try:
             # Preferred: role-based messages
             messages = [
                 ("system", system_prompt),
                 ("user", user_prompt),
             ]
-            resp = llm.invoke(messages)
-        except TypeError:
+            resp = self._invoke_or_stream(llm, messages, tracked_on_token)
+        except TypeError as e:
+            if sent:
+                return self._error_reply(sent, e, on_token)
             # Fallback if the model doesn't support (role, content) tuples
             combined_prompt = system_prompt + "\n\n" + user_prompt
             try:
-                resp = llm.invoke(combined_prompt)
+                resp = self._invoke_or_stream(llm, combined_prompt, tracked_on_token)
             except Exception as e:
-                return f"[LLM error] {e}"
+                return self._error_reply(sent, e, on_token)
         except Exception as e:
-            return f"[LLM error] {e}"
+            return self._error_reply(sent, e, on_token)
 
         if hasattr(resp, "content"):
             return resp.content
@@ -175,7 +229,7 @@ class LLMBackend:
         """
         llm = self.get_langchain_llm()
         if llm is None:
-            return "[LLM error] LLM not properly configured"
+            return f"{LLM_ERROR_PREFIX} LLM not properly configured"
         
         try:
             resp = llm.invoke(messages)
@@ -183,4 +237,4 @@ class LLMBackend:
                 return resp.content
             return str(resp)
         except Exception as e:
-            return f"[LLM error] {e}"
+            return f"{LLM_ERROR_PREFIX} {e}"
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import replace
-from typing import List, Tuple, Optional, Dict, Any
+from typing import Callable, List, Tuple, Optional, Dict, Any
 
 from langchain_core.documents import Document
 
@@ -121,6 +121,7 @@ def _multiagent_answer_question_core(
     question: str,
     config: RAGConfig,
     show_reasoning: bool = False,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Tuple[str, List[Document], Optional[str]]:
     
     supervisor_backend = LLMBackend(config)
@@ -144,7 +145,7 @@ def _multiagent_answer_question_core(
             "HOWEVER, if the user specifically asks for LEGAL ADVICE on a real case and you have no context, "
             "kindly state that you don't have access to those specific legal files."
         )
-        answer = supervisor_backend.chat(system_prompt, f"User Question: {question}")
+        answer = supervisor_backend.chat(system_prompt, f"User Question: {question}", on_token=on_token)
         
         reasoning_trace = None
         if show_reasoning:
@@ -218,7 +219,7 @@ def _multiagent_answer_question_core(
         fallback_config.vector_store_dirs = all_paths
         
         fallback_answer, fallback_docs, fallback_trace = single_agent_answer_question(
-            question, fallback_config, show_reasoning=show_reasoning
+            question, fallback_config, show_reasoning=show_reasoning, on_token=on_token
         )
         final_answer = fallback_answer
         all_docs = fallback_docs
@@ -251,7 +252,7 @@ def _multiagent_answer_question_core(
         "Now provide a single final answer to the user, in your own words."
     )
 
-    final_answer = supervisor_backend.chat(system_prompt, user_prompt)
+    final_answer = supervisor_backend.chat(system_prompt, user_prompt, on_token=on_token)
 
     # --- REASONING TRACE CONSTRUCTION ---
     if show_reasoning:
@@ -302,6 +303,7 @@ def multiagent_answer_question(
     question: str,
     config: RAGConfig,
     show_reasoning: bool = False,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Tuple[str, List[Document], Optional[str]]:
     """Public entrypoint for multi-agent RAG with supervisor (alias)"""
-    return _multiagent_answer_question_core(question, config, show_reasoning)
\ No newline at end of file
+    return _multiagent_answer_question_core(question, config, show_reasoning, on_token)
\ No newline at end of file
@@ -1,36 +1,97 @@
 # backend/rag_pipeline.py
 from __future__ import annotations
 
-from typing import List, Tuple, Optional, Dict, Any
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Tuple, Optional, Dict, Any, Union
 
 from langchain_core.documents import Document
 
 from .config import RAGConfig
 from .rag_single_agent import single_agent_answer_question
 from .rag_multiagent import multiagent_answer_question
-from .hybrid_rag import hybrid_answer_question  
+from .hybrid_rag import hybrid_answer_question
 
 
 def answer_question(
     question: str,
     config: RAGConfig,
     show_reasoning: bool = False,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Tuple[str, List[Document], Optional[str], Optional[Dict[str, Any]]]:
     """
     Public entrypoint used by the Chatbot interface.
+    If `on_token` is given, the final answer is streamed to it chunk by chunk.
     """
 
     # 1) Hybrid mode (metadata filtering + vector similarity)
     if getattr(config, "agentic_mode", "") == "hybrid_rag":
-        answer, docs, reasoning, meta = hybrid_answer_question(question, config, show_reasoning)
+        answer, docs, reasoning, meta = hybrid_answer_question(question, config, show_reasoning, on_token)
         return answer, docs, reasoning, meta
 
     # 2) Multi-agent mode
     if getattr(config, "use_multiagent", False):
-        answer, docs, reasoning = multiagent_answer_question(question, config, show_reasoning)
+        answer, docs, reasoning = multiagent_answer_question(question, config, show_reasoning, on_token)
         return answer, docs, reasoning, None
 
     # 3) Single-agent mode (ReAct)
-    answer, docs, reasoning = single_agent_answer_question(question, config, show_reasoning)
+    answer, docs, reasoning = single_agent_answer_question(question, config, show_reasoning, on_token)
     return answer, docs, reasoning, None
 
+
+# =====================================================================
+# Streaming
+# =====================================================================
+
+@dataclass
+class StreamedAnswer:
+    """Sentinel yielded last by iter_streamed, carrying the full result"""
+    answer: str
+    docs: List[Document]
+    reasoning: Optional[str]
+    metadata: Optional[Dict[str, Any]]
+
+
+def iter_streamed(
+    run: Callable[[Callable[[str], None]], Tuple[str, List[Document], Optional[str], Optional[Dict[str, Any]]]],
+    on_thread_start: Optional[Callable[[threading.Thread], None]] = None,
+) -> Iterator[Union[str, StreamedAnswer]]:
+    """
+    Run `run(on_token)` in a worker thread and yield text chunks as they
+    arrive, then a StreamedAnswer. If nothing was streamed (e.g. the model
+    does not support streaming), the full answer is yielded in one chunk.
+
+    `run` is typically
+    `lambda on_token: answer_question(question, config, show_reasoning, on_token)`.
+    """
+    chunks: "queue.Queue[Optional[str]]" = queue.Queue()
+    outcome: Dict[str, Any] = {}
+
+    def _worker():
+        try:
+            outcome["result"] = run(chunks.put)
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            chunks.put(None)
+
+    worker = threading.Thread(target=_worker, daemon=True)
+    if on_thread_start is not None:
+        on_thread_start(worker)
+    worker.start()
+
+    streamed = False
+    while (chunk := chunks.get()) is not None:
+        streamed = True
+        yield chunk
+    worker.join()
+
+    if "error" in outcome:
+        raise outcome["error"]
+
+    answer, docs, reasoning, metadata = outcome["result"]
+    if not streamed and answer:
+        yield answer
+    yield StreamedAnswer(answer, docs, reasoning, metadata)
+
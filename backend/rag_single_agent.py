@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Tuple, Optional, Dict, Any
+from typing import Callable, List, Tuple, Optional, Dict, Any
 
 import numpy as np
 from langchain_core.documents import Document
@@ -233,6 +233,7 @@ def _single_agent_answer_question_core(
     question: str,
     config: RAGConfig,
     show_reasoning: bool = False,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Tuple[str, List[Document], Optional[str]]:
     
     llm_backend = LLMBackend(config)
@@ -349,7 +350,7 @@ def _single_agent_answer_question_core(
     user_parts = [f"Question:\n{question}", user_context_part, fallback_msg]
     user_prompt = "\n\n".join(user_parts)
 
-    answer = llm_backend.chat(system_prompt, user_prompt)
+    answer = llm_backend.chat(system_prompt, user_prompt, on_token=on_token)
 
     # ---- 5. LOGGING / TRACING (Opzionale) ----
     reasoning_trace: Optional[str] = None
@@ -408,6 +409,7 @@ def single_agent_answer_question(
     question: str,
     config: RAGConfig,
     show_reasoning: bool = False,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Tuple[str, List[Document], Optional[str]]:
     """Public entrypoint for single-agent RAG (alias)"""
-    return _single_agent_answer_question_core(question, config, show_reasoning)
\ No newline at end of file
+    return _single_agent_answer_question_core(question, config, show_reasoning, on_token)
\ No newline at end of file
@@ -6,28 +6,51 @@ and reasoning/sources visualization.
 """
 
 import streamlit as st
+# Streamlit runtime API (not part of the st.* surface): the streaming worker
+# thread needs the script run context attached to use st.cache_data
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+import copy
+import functools
+import hashlib
 import json
 from pathlib import Path
 from datetime import datetime
 import sys
 import os
+import time
+
+# Optional: orjson makes the conversation export much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # 1. IMPORTANT: Load environment variables immediately
 from dotenv import load_dotenv
-load_dotenv()
 
-# Debug (Optional): Check if keys were loaded
-# If you see these errors, the name in .env is different or the file cannot be found
-if not os.getenv("OPENROUTER_API_KEY"):
-    st.error("⚠️ ERROR: The 'OPENROUTER_API_KEY' key was not found in the .env file!")
-if not os.getenv("HUGGINGFACEHUB_API_TOKEN"):
-    st.warning("⚠️ WARNING: The 'HUGGINGFACEHUB_API_TOKEN' key was not found (only needed for HuggingFace models).")
+@st.cache_resource(show_spinner=False)
+def _load_env():
+    """Parse .env once per process and report which keys were found"""
+    load_dotenv()
+    return {
+        "openrouter": bool(os.getenv("OPENROUTER_API_KEY")),
+        "hf": bool(os.getenv("HUGGINGFACEHUB_API_TOKEN")),
+    }
 
 # Add backend to path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from backend.config import RAGConfig
-from backend.rag_pipeline import answer_question
+
+
+# show_spinner=False: also called from the streaming worker thread (via
+# _cached_answer), which has no container to draw a spinner into
+@st.cache_resource(show_spinner=False)
+def _get_rag_pipeline():
+    """Import the RAG pipeline (LangChain, embeddings, FAISS) on first use only,
+    so the page can render before the heavy imports are paid for"""
+    from backend import rag_pipeline
+    return rag_pipeline
 
 
 # =====================================================================
@@ -41,14 +64,67 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Cached call: must come after set_page_config, like load_config() in Home.py
+ENV_STATUS = _load_env()
+
 # =====================================================================
 # SESSION STATE INITIALIZATION
 # =====================================================================
 
+# Retrieval/agent settings the sidebar can change for a single session.
+# They live in session_state so the cached base config is never mutated.
+SESSION_CONFIG_KEYS = ("top_k", "top_k_final", "use_rerank", "agentic_mode", "use_multiagent")
+
+# show_spinner=False: _rebuild_config also calls this from the worker thread
+@st.cache_resource(show_spinner=False)
+def get_base_config():
+    """Load configuration once and cache it (shared across sessions)"""
+    return RAGConfig()
+
+def _rebuild_config(**overrides) -> RAGConfig:
+    """Return a shallow copy of the base config with the given field overrides"""
+    session_config = copy.copy(get_base_config())
+    for key, value in overrides.items():
+        setattr(session_config, key, value)
+    return session_config
+
+def get_session_settings() -> dict:
+    """Return this session's sidebar overrides as plain (hashable) values"""
+    return {key: st.session_state[key] for key in SESSION_CONFIG_KEYS}
+
+def reload_base_config() -> RAGConfig:
+    """Drop the cached config and rescan the vector store directories"""
+    get_base_config.clear()
+    return get_base_config()
+
+# Minimum seconds between two per-session rescans while no vector store exists
+STORE_RESCAN_INTERVAL = 30
+
+def _rescan_if_no_stores(config: RAGConfig) -> RAGConfig:
+    """Pick up vector stores built after the server started.
+
+    Scans into a local RAGConfig, at most every STORE_RESCAN_INTERVAL seconds
+    per session, and replaces the shared cached config only if stores were found.
+    """
+    if config.vector_store_dirs:
+        return config
+
+    now = time.monotonic()
+    if now - st.session_state.get("last_store_scan", float("-inf")) < STORE_RESCAN_INTERVAL:
+        return config
+    st.session_state.last_store_scan = now
+
+    if not RAGConfig().vector_store_dirs:
+        return config
+    return reload_base_config()
+
 def init_session_state():
     """Initialize session state variables"""
-    # Always reload config to update vector stores
-    st.session_state.config = RAGConfig()
+    st.session_state.config = _rescan_if_no_stores(get_base_config())
+
+    for key in SESSION_CONFIG_KEYS:
+        if key not in st.session_state:
+            st.session_state[key] = getattr(st.session_state.config, key)
 
     if "messages" not in st.session_state:
         st.session_state.messages = []
@@ -56,20 +132,56 @@ def init_session_state():
     if "conversation_log" not in st.session_state:
         st.session_state.conversation_log = []
 
+    # doc_id -> {"page_content", "metadata"}, shared by all logged turns
+    if "source_store" not in st.session_state:
+        st.session_state.source_store = {}
+
+# =====================================================================
+# PATH HELPERS
+# =====================================================================
+
+def _basename(path: str) -> str:
+    """Path(path).name without building a Path object ('/' or '\\' separators)"""
+    return path.rsplit("/", 1)[-1].rsplit("\\", 1)[-1]
+
+def _parent_name(path: str) -> str:
+    """Path(path).parent.name without building a Path object"""
+    parent, sep, _ = path.replace("\\", "/").rpartition("/")
+    return _basename(parent) if sep else ""
+
+@st.cache_data(show_spinner=False)
+def _db_list_markdown(vector_store_dirs: tuple) -> str:
+    """Sorted vector DB list as one markdown string, rebuilt only when the DB list changes"""
+    lines = []
+    for db_name in sorted(_basename(db_path) for db_path in vector_store_dirs):
+        if "_codes" in db_name:
+            lines.append(f"- 📝 {db_name} (Codes)")
+        elif "_cases" in db_name:
+            lines.append(f"- ⚖️ {db_name} (Cases)")
+        else:
+            lines.append(f"- 📁 {db_name}")
+    return "\n".join(lines)
+
 # =====================================================================
 # SIDEBAR CONFIGURATION
 # =====================================================================
 
-def render_sidebar():
-    """Render configuration sidebar"""
-    st.sidebar.title("⚙️ Configuration")
+def _seed_widget(widget_key: str, value):
+    """Give a keyed widget its initial value (only if it has none yet)"""
+    if widget_key not in st.session_state:
+        st.session_state[widget_key] = value
+
+@st.fragment
+def _render_sidebar_body():
+    """Sidebar widgets (fragment: slider/checkbox changes rerun only the sidebar)"""
+    st.title("⚙️ Configuration")
 
     config = st.session_state.config
 
     # Agent Mode Selection
-    st.sidebar.subheader("Agent Architecture")
+    st.subheader("Agent Architecture")
 
-    agent_mode = st.sidebar.radio(
+    agent_mode = st.radio(
         "Select agent type:",
         options=[
             "Single Agent (ReAct)",
@@ -83,132 +195,262 @@ def render_sidebar():
         )
     )
 
-    # Update config based on selection
+    # Update session settings based on selection
     if agent_mode == "Single Agent (ReAct)":
-        config.agentic_mode = "react"
-        config.use_multiagent = False
+        st.session_state.agentic_mode = "react"
+        st.session_state.use_multiagent = False
 
     elif agent_mode == "Multi-Agent (Supervisor)":
-        config.agentic_mode = "react"
-        config.use_multiagent = True
+        st.session_state.agentic_mode = "react"
+        st.session_state.use_multiagent = True
 
     else:  # Hybrid (Metadata + Vector)
-        config.agentic_mode = "hybrid_rag"
-        config.use_multiagent = False
+        st.session_state.agentic_mode = "hybrid_rag"
+        st.session_state.use_multiagent = False
 
     # Show reasoning toggle
-    show_reasoning = st.sidebar.checkbox(
+    st.checkbox(
         "Show reasoning trace",
         value=False,
+        key="show_reasoning",
         help="Display internal agent reasoning and retrieval logs"
     )
 
-    st.sidebar.divider()
+    st.divider()
 
     # Retrieval Parameters
-    st.sidebar.subheader("Retrieval Parameters")
+    st.subheader("Retrieval Parameters")
+
+    # Keyed widgets without value=: a value that changes between runs would
+    # give the widget a new identity and drop the user's next change. The
+    # widget keys are seeded from the session settings when missing.
+    _seed_widget("_w_top_k", int(st.session_state.top_k))
+    _seed_widget("_w_top_k_final", int(st.session_state.top_k_final))
+    _seed_widget("_w_use_rerank", bool(st.session_state.use_rerank))
 
-    config.top_k = st.sidebar.slider(
+    st.session_state.top_k = st.slider(
         "Initial retrieval (top_k)",
         min_value=5,
         max_value=30,
-        value=int(config.top_k),
+        key="_w_top_k",
         help="Number of documents to retrieve initially"
     )
 
-    config.top_k_final = st.sidebar.slider(
+    st.session_state.top_k_final = st.slider(
         "Final documents (top_k_final)",
         min_value=3,
         max_value=20,
-        value=int(config.top_k_final),
+        key="_w_top_k_final",
         help="Number of documents after reranking (mainly used by agentic modes)"
     )
 
-    config.use_rerank = st.sidebar.checkbox(
+    st.session_state.use_rerank = st.checkbox(
         "Enable similarity reranking",
-        value=bool(config.use_rerank),
+        key="_w_use_rerank",
         help="Rerank documents by cosine similarity"
     )
 
-    st.sidebar.divider()
+    st.divider()
 
     # Model Information
-    st.sidebar.subheader("Model Info")
-    st.sidebar.text(f"LLM: {config.llm_model_name}")
-    st.sidebar.text(f"Embeddings: {config.embedding_model_name}")
+    st.subheader("Model Info")
+    st.text(f"LLM: {config.llm_model_name}")
+    st.text(f"Embeddings: {config.embedding_model_name}")
 
     # Vector Store Info
-    st.sidebar.subheader("Vector Store Info")
+    st.subheader("Vector Store Info")
     if config.vector_store_dirs:
-        st.sidebar.text(f"Vector DBs: {len(config.vector_store_dirs)}")
+        st.text(f"Vector DBs: {len(config.vector_store_dirs)}")
 
-        db_names = sorted([Path(db_path).name for db_path in config.vector_store_dirs])
-
-        for db_name in db_names:
-            if "_codes" in db_name:
-                st.sidebar.caption(f" 📝 {db_name} (Codes)")
-            elif "_cases" in db_name:
-                st.sidebar.caption(f" ⚖️ {db_name} (Cases)")
-            else:
-                st.sidebar.caption(f" 📁 {db_name}")
+        # One element for the whole list instead of one caption per DB
+        st.caption(_db_list_markdown(tuple(config.vector_store_dirs)))
     else:
-        st.sidebar.warning("Vector DBs list is empty in config.")
+        st.warning("Vector DBs list is empty in config.")
+
+    if st.button("🔄 Reload vector stores", help="Rescan the vector store folder for new DBs"):
+        st.session_state.config = reload_base_config()
+        st.rerun()
 
-    st.sidebar.divider()
+    st.divider()
 
     # Export conversation
-    if st.sidebar.button("💾 Export Conversation"):
+    if st.button("💾 Export Conversation"):
         export_conversation()
 
     # Clear conversation
-    if st.sidebar.button("🗑️ Clear Conversation"):
+    if st.button("🗑️ Clear Conversation"):
         st.session_state.messages = []
         st.session_state.conversation_log = []
+        st.session_state.source_store = {}
+        st.session_state.pop("session_id", None)
+        st.session_state.pop("last_export", None)
+        for key in [k for k in st.session_state if str(k).startswith("show_src_")]:
+            del st.session_state[key]
         st.rerun()
 
-    return show_reasoning
+def render_sidebar():
+    """Render configuration sidebar and return the 'show reasoning' toggle"""
+    # Fragments cannot write to st.sidebar directly, so enter it first
+    with st.sidebar:
+        _render_sidebar_body()
+
+    return st.session_state.show_reasoning
 
 # =====================================================================
 # CHAT INTERFACE
 # =====================================================================
 
+def _build_display_sources(docs):
+    """Precompute the strings shown for each source, once per turn"""
+    display_sources = []
+    for doc in docs or []:
+        meta = doc.metadata or {}
+        source = meta.get("source") or ""
+        display_sources.append({
+            "db_name": meta.get("db_name") or _parent_name(source),
+            "country": meta.get("country", "unknown"),
+            "law": meta.get("law", "unknown"),
+            "source_name": _basename(source),
+            "snippet": (doc.page_content or "")[:300] + "...",
+        })
+    return display_sources
+
+def _open_sources(state_key: str):
+    """Button callback: mark a message's sources as opened"""
+    st.session_state[state_key] = True
+
+def _render_assistant_payload(message, msg_id: int, show_content: bool = True):
+    """Render a chat message body with its sources, reasoning and metadata"""
+    if show_content:
+        st.markdown(message["content"])
+
+    if message.get("cached"):
+        st.caption("⚡ Cached answer")
+
+    # Show sources if available; the body is only built once the user asks for it,
+    # since a collapsed expander still runs (and ships) its whole content
+    if message.get("display_sources"):
+        num_sources = len(message["display_sources"])
+        state_key = f"show_src_{msg_id}"
+        if not st.session_state.get(state_key):
+            # on_click runs before the rerun, so the button is gone once clicked
+            st.button(
+                f"📚 Show sources ({num_sources} documents)",
+                key=f"btn_{state_key}",
+                on_click=_open_sources,
+                args=(state_key,),
+            )
+
+        if st.session_state.get(state_key):
+            with st.expander(f"📚 Sources ({num_sources} documents)", expanded=True):
+                for i, src in enumerate(message["display_sources"], 1):
+                    st.markdown(f"**Document {i}**")
+                    st.caption(f"DB: {src['db_name']}")
+                    st.caption(f"Country: {src['country']}")
+                    st.caption(f"Law: {src['law']}")
+                    st.caption(f"Source: {src['source_name']}")
+                    st.text(src["snippet"])
+                    st.divider()
+
+    # Show reasoning trace if available
+    if message.get("reasoning"):
+        with st.expander("🔍 Reasoning Trace"):
+            st.markdown(message["reasoning"])
+
+    # Show extracted metadata
+    if message.get("metadata"):
+        with st.expander("📋 Extracted Metadata"):
+            st.json(message["metadata"])
+
+@st.fragment
+def _render_history():
+    """Render chat messages (fragment: not redrawn by unrelated widget reruns).
+
+    A newly submitted question is answered here too, so the latest turn lives
+    inside the fragment like the older ones and is never drawn twice.
+    """
+    for msg_id, message in enumerate(st.session_state.messages):
+        with st.chat_message(message["role"]):
+            _render_assistant_payload(message, msg_id)
+
+    pending = st.session_state.pop("pending_question", None)
+    if pending is not None:
+        handle_user_input(pending["prompt"], pending["show_reasoning"])
+
 def render_chat_interface(show_reasoning: bool):
     """Render main chat interface"""
 
-    # Display chat messages
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
-
-            # Show sources if available
-            if "sources" in message and message["sources"]:
-                with st.expander(f"📚 Sources ({len(message['sources'])} documents)"):
-                    for i, doc in enumerate(message["sources"], 1):
-                        meta = doc.metadata or {}
-                        st.markdown(f"**Document {i}**")
-                        db_name = meta.get("db_name", Path(meta.get("source", "")).parent.name)
-                        st.caption(f"DB: {db_name}")
-                        st.caption(f"Country: {meta.get('country', 'unknown')}")
-                        st.caption(f"Law: {meta.get('law', 'unknown')}")
-                        st.caption(f"Source: {Path(meta.get('source', '')).name}")
-
-                        snippet = (doc.page_content or "")[:300] + "..."
-                        st.text(snippet)
-                        st.divider()
-
-            # Show reasoning trace if available
-            if "reasoning" in message and message["reasoning"]:
-                with st.expander("🔍 Reasoning Trace"):
-                    st.markdown(message["reasoning"])
-
-            # Show extracted metadata
-            if "metadata" in message and message["metadata"]:
-                with st.expander("📋 Extracted Metadata"):
-                    st.json(message["metadata"])
-
-    # Chat input
+    # Chat input (always pinned to the bottom of the page)
     if prompt := st.chat_input("Ask a legal question..."):
-        handle_user_input(prompt, show_reasoning)
+        st.session_state.pending_question = {"prompt": prompt, "show_reasoning": show_reasoning}
+
+    # Display chat messages
+    _render_history()
+
+class _UncachedAnswer(Exception):
+    """Raised by _cached_answer to hand back a result without caching it"""
+
+    def __init__(self, result):
+        super().__init__("LLM error result, not cached")
+        self.result = result
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=256)
+def _cached_answer(prompt, top_k, top_k_final, use_rerank, agentic_mode, use_multiagent,
+                   show_reasoning, vector_store_dirs, _misses, _on_token=None):
+    """Memoized answer_question keyed on the prompt and scalar config fields.
+
+    RAGConfig is not hashable, so it is rebuilt from the scalars here. The
+    vector store list is part of the key, so answers built from an older DB
+    set are not replayed after the stores are reloaded. `_misses`
+    is not hashed; it is appended to only when the pipeline actually runs.
+    `_on_token` (also not hashed) receives the streamed answer on a miss.
+    LLM error answers are raised as _UncachedAnswer so they are never replayed.
+    """
+    from backend.llm_provider import is_llm_error
+
+    _misses.append(True)
+    result = _get_rag_pipeline().answer_question(
+        question=prompt,
+        config=_rebuild_config(
+            top_k=top_k,
+            top_k_final=top_k_final,
+            use_rerank=use_rerank,
+            agentic_mode=agentic_mode,
+            use_multiagent=use_multiagent,
+            vector_store_dirs=list(vector_store_dirs),
+        ),
+        show_reasoning=show_reasoning,
+        on_token=_on_token,
+    )
+    if is_llm_error(result[0]):
+        raise _UncachedAnswer(result)
+    return result
+
+def _stream_answer(prompt: str, show_reasoning: bool, settings: dict, misses: list):
+    """Yield answer chunks for st.write_stream; stash the full result in session_state"""
+    vector_store_dirs = tuple(st.session_state.config.vector_store_dirs)
+
+    def run(on_token):
+        try:
+            return _cached_answer(
+                prompt,
+                show_reasoning=show_reasoning,
+                vector_store_dirs=vector_store_dirs,
+                _misses=misses,
+                _on_token=on_token,
+                **settings
+            )
+        except _UncachedAnswer as e:
+            return e.result
+
+    rag_pipeline = _get_rag_pipeline()
+
+    # The worker thread needs the script context to use st.cache_data
+    for chunk in rag_pipeline.iter_streamed(run, on_thread_start=add_script_run_ctx):
+        if isinstance(chunk, rag_pipeline.StreamedAnswer):
+            st.session_state["stream_result"] = chunk
+        else:
+            yield chunk
 
 def handle_user_input(prompt: str, show_reasoning: bool):
     """Handle user input and generate response"""
@@ -221,46 +463,24 @@ def handle_user_input(prompt: str, show_reasoning: bool):
     with st.chat_message("assistant"):
         with st.spinner("Thinking..."):
             try:
-                answer, docs, reasoning, metadata = answer_question(
-                    question=prompt,
-                    config=st.session_state.config,
-                    show_reasoning=show_reasoning
+                misses = []
+                st.write_stream(
+                    _stream_answer(prompt, show_reasoning, get_session_settings(), misses)
+                )
+                result = st.session_state.pop("stream_result")
+                answer, docs, reasoning, metadata = (
+                    result.answer, result.docs, result.reasoning, result.metadata
                 )
-
-                st.markdown(answer)
-
-                # Display Sources
-                if docs:
-                    with st.expander(f"📚 Sources ({len(docs)} documents)"):
-                        for i, doc in enumerate(docs, 1):
-                            meta = doc.metadata or {}
-                            st.markdown(f"**Document {i}**")
-                            db_name = meta.get("db_name", Path(meta.get("source", "")).parent.name)
-                            st.caption(f"DB: {db_name}")
-                            st.caption(f"Country: {meta.get('country', 'unknown')}")
-                            st.caption(f"Law: {meta.get('law', 'unknown')}")
-                            st.caption(f"Source: {Path(meta.get('source', '')).name}")
-
-                            snippet = (doc.page_content or "")[:300] + "..."
-                            st.text(snippet)
-                            st.divider()
-
-                # Display Reasoning
-                if reasoning and show_reasoning:
-                    with st.expander("🔍 Reasoning Trace"):
-                        st.markdown(reasoning)
-
-                # Display Metadata
-                if metadata:
-                    with st.expander("📋 Extracted Metadata"):
-                        st.json(metadata)
 
                 assistant_message = {
                     "role": "assistant",
                     "content": answer,
-                    "sources": docs,
+                    "display_sources": _build_display_sources(docs),
                 }
 
+                if not misses:
+                    assistant_message["cached"] = True
+
                 if reasoning:
                     assistant_message["reasoning"] = reasoning
 
@@ -271,7 +491,11 @@ def handle_user_input(prompt: str, show_reasoning: bool):
 
                 log_conversation_turn(prompt, answer, docs, metadata)
 
-                st.rerun()
+                # Answer text is already on screen from the stream; later runs
+                # of the history fragment draw this message from the list
+                _render_assistant_payload(
+                    assistant_message, len(st.session_state.messages) - 1, show_content=False
+                )
 
             except Exception as e:
                 st.error(f"Error generating response: {e}")
@@ -280,23 +504,43 @@ def handle_user_input(prompt: str, show_reasoning: bool):
 # CONVERSATION LOGGING
 # =====================================================================
 
+def _store_sources(docs):
+    """Save source texts once per session and return their doc ids.
+
+    Ids are built from the source path and a content hash, so a chunk cited
+    again in a later turn reuses the stored entry instead of a new copy.
+    """
+    source_store = st.session_state.source_store
+    doc_ids = []
+    for d in docs or []:
+        content = d.page_content or ""
+        source = (d.metadata or {}).get("source", "")
+        doc_id = f"{source}#{hashlib.sha1(content.encode('utf-8')).hexdigest()[:12]}"
+        if doc_id not in source_store:
+            source_store[doc_id] = {"page_content": content, "metadata": d.metadata or {}}
+        doc_ids.append(doc_id)
+    return doc_ids
+
 def log_conversation_turn(question: str, answer: str, docs, metadata=None):
     """Log a conversation turn"""
+    ts_ns = time.time_ns()
+
+    # The export session id is fixed by the first logged turn
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = ts_ns // 1_000_000_000
+
     turn = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.fromtimestamp(ts_ns / 1e9).isoformat(),
         "question": question,
         "answer": answer,
         "num_sources": len(docs) if docs else 0,
-        "raw_sources": [
-            {"page_content": d.page_content, "metadata": d.metadata}
-            for d in (docs or [])
-        ],
+        "raw_source_ids": _store_sources(docs),
         "sources": [
             {
-                "db_name": doc.metadata.get("db_name", Path(doc.metadata.get("source", "")).parent.name),
+                "db_name": doc.metadata.get("db_name") or _parent_name(doc.metadata.get("source") or ""),
                 "country": doc.metadata.get("country"),
                 "law": doc.metadata.get("law"),
-                "source": Path(doc.metadata.get("source", "")).name,
+                "source": _basename(doc.metadata.get("source") or ""),
             }
             for doc in (docs or [])
         ],
@@ -307,46 +551,39 @@ def log_conversation_turn(question: str, answer: str, docs, metadata=None):
 
     st.session_state.conversation_log.append(turn)
 
-def export_conversation():
-    """Export conversation log to JSON in the specific requested format,
-    making source paths relative to the 'Contest_Data' directory.
-    """
-    if not st.session_state.conversation_log:
-        st.sidebar.warning("No conversation to export")
-        return
-
-    config = st.session_state.config
-    BASE_FOLDER_NAME = Path(config.data_base_dir).name  # 'Contest_Data'
-
-    first_question = st.session_state.conversation_log[0]["question"]
+@functools.lru_cache(maxsize=None)
+def _relative_source_id(src_path_abs, needle: str):
+    """Cut a source path down to the part starting at `needle` ('Contest_Data/')"""
+    # Metadata may carry source=None; keep non-string values as they are
+    if not isinstance(src_path_abs, str):
+        return src_path_abs
+    _, sep, after = src_path_abs.replace("\\", "/").partition(needle)
+    return (needle + after) if sep else src_path_abs
+
+def _serialize_session(session_id: int, base_folder_name: str,
+                       conversation_log, source_store) -> bytes:
+    """Build the export JSON (UTF-8 bytes)"""
+    needle = base_folder_name + "/"
+
+    first_question = conversation_log[0]["question"]
     title = first_question[:60] + "..." if len(first_question) > 60 else first_question
 
     history = []
 
-    for turn in st.session_state.conversation_log:
+    for turn in conversation_log:
         history.append({"role": "user", "content": turn["question"]})
 
         contexts = []
         source_ids = []
 
-        if "raw_sources" in turn:
-            for source in turn["raw_sources"]:
-                contexts.append(source.get("page_content", "").strip())
+        for doc_id in turn.get("raw_source_ids", []):
+            source = source_store[doc_id]
+            contexts.append(source.get("page_content", "").strip())
 
-                meta = source.get("metadata", {})
-                src_path_abs = meta.get("source", "unknown_source")
+            meta = source.get("metadata", {})
+            src_path_abs = meta.get("source", "unknown_source")
 
-                try:
-                    normalized_path = src_path_abs.replace("\\\\", "/")
-                    start_index = normalized_path.find(BASE_FOLDER_NAME + "/")
-
-                    if start_index != -1:
-                        relative_path = normalized_path[start_index:]
-                        source_ids.append(relative_path)
-                    else:
-                        source_ids.append(src_path_abs)
-                except Exception:
-                    source_ids.append(src_path_abs)
+            source_ids.append(_relative_source_id(src_path_abs, needle))
 
         assistant_message = {
             "role": "assistant",
@@ -357,8 +594,6 @@ def export_conversation():
         }
         history.append(assistant_message)
 
-    session_id = int(datetime.now().timestamp())
-
     session_data = {
         "id": session_id,
         "title": title,
@@ -366,12 +601,45 @@ def export_conversation():
     }
 
     final_export = [session_data]
-    json_str = json.dumps(final_export, indent=2, ensure_ascii=False)
+    # Compact output: the export is machine-read by the Evaluation page
+    if orjson is not None:
+        return orjson.dumps(final_export, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(final_export, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
-    st.sidebar.download_button(
+def export_conversation():
+    """Export conversation log to JSON in the specific requested format,
+    making source paths relative to the 'Contest_Data' directory.
+    """
+    conversation_log = st.session_state.conversation_log
+    if not conversation_log:
+        st.warning("No conversation to export")
+        return
+
+    config = st.session_state.config
+    base_folder_name = _basename(config.data_base_dir)  # 'Contest_Data'
+
+    # Only the latest export is kept (per session), keyed on the logged turns,
+    # so repeated exports of an unchanged log do not re-serialize it
+    log_key = tuple((turn["timestamp"], turn["question"]) for turn in conversation_log)
+    last_export = st.session_state.get("last_export")
+    if last_export is not None and last_export[0] == log_key:
+        json_bytes = last_export[1]
+    else:
+        json_bytes = _serialize_session(
+            st.session_state.session_id,
+            base_folder_name,
+            conversation_log,
+            st.session_state.source_store,
+        )
+        st.session_state.last_export = (log_key, json_bytes)
+
+    # Same clock source as the turn timestamps and session id
+    export_ns = time.time_ns()
+
+    st.download_button(
         label="📥 Download JSON Session",
-        data=json_str,
-        file_name=f"chat_session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+        data=json_bytes,
+        file_name=f"chat_session_{datetime.fromtimestamp(export_ns / 1e9).strftime('%Y%m%d_%H%M%S')}.json",
         mime="application/json"
     )
 
@@ -379,8 +647,22 @@ def export_conversation():
 # MAIN
 # =====================================================================
 
+def show_env_warnings():
+    """Show missing-key warnings on the first run of a session only"""
+    if st.session_state.get("env_checked"):
+        return
+    st.session_state.env_checked = True
+
+    # Debug (Optional): Check if keys were loaded
+    # If you see these errors, the name in .env is different or the file cannot be found
+    if not ENV_STATUS["openrouter"]:
+        st.error("⚠️ ERROR: The 'OPENROUTER_API_KEY' key was not found in the .env file!")
+    if not ENV_STATUS["hf"]:
+        st.warning("⚠️ WARNING: The 'HUGGINGFACEHUB_API_TOKEN' key was not found (only needed for HuggingFace models).")
+
 def main():
     init_session_state()
+    show_env_warnings()
 
     st.title("💬 Legal RAG Chatbot")
     st.caption("Ask questions about divorce and inheritance law across Italy, Estonia, and Slovenia")